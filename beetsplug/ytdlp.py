@@ -1,12 +1,84 @@
 from beets import config
+import atexit
 import dataclasses
+import functools
+import hashlib
+import json
 from beets import ui
 from beets.plugins import BeetsPlugin
+from beets.ui.commands import import_cmd
 import optparse
-from ytmusicapi import YTMusic
-from yt_dlp import YoutubeDL
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-import subprocess
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+# yt-dlp and ytmusicapi are slow to import, so they are only imported once a download
+# actually happens rather than on every beet invocation that loads the plugin
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+    from ytmusicapi import YTMusic
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Upper bound on parallel track downloads, beyond which YouTube starts rate limiting
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# File in each album's cache directory listing the tracks that finished downloading
+FINISHED_MANIFEST = ".ytdlp-finished"
+
+# Characters that cannot appear in a path component on common filesystems
+_SANITIZE_TABLE = str.maketrans({c: "-" for c in '/\\:*?"<>|'})
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize JSON, using orjson when it is installed."""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def _tree_size(entry: os.DirEntry) -> int:
+    """Total size in bytes of a file, or of every file below a directory."""
+    if not entry.is_dir(follow_symlinks=False):
+        return entry.stat(follow_symlinks=False).st_size
+    with os.scandir(entry.path) as it:
+        return sum(_tree_size(child) for child in it)
+
+def _trim_song_results(results: list[dict]) -> list[dict]:
+    """Keep only the top song search result, with the fields used to build SingletonDetails."""
+    return [
+        {'title': r['title'], 'artists': [{'name': a['name']} for a in r['artists'][:1]],
+         'videoId': r['videoId']}
+        for r in results[:1]
+    ]
+
+def _trim_album_results(results: list[dict]) -> list[dict]:
+    """Keep only the browse id of the top album search result."""
+    return [{'browseId': r['browseId']} for r in results[:1]]
+
+def _trim_album(album: dict) -> dict:
+    """Keep only the fields of an album that are used to build AlbumDetails."""
+    return {
+        'title': album['title'],
+        'artists': [{'name': a['name']} for a in album['artists'][:1]],
+        'audioPlaylistId': album['audioPlaylistId'],
+        'tracks': [{'isAvailable': t['isAvailable']} for t in album['tracks']],
+    }
+
+def _album_available(album: dict) -> bool:
+    """Whether every track of an album can be downloaded."""
+    return all(track['isAvailable'] for track in album['tracks'])
 
 class Colors():
     INFO = '\033[94m'
@@ -15,30 +87,131 @@ class Colors():
     BOLD = '\033[1m'
     END = '\033[0m'
 
-@dataclasses.dataclass
+# Only color output written to a terminal, so escape codes do not leak into logs
+_SUCCESS_PFX = Colors.SUCCESS if sys.stdout.isatty() else ""
+_WARNING_PFX = Colors.WARNING if sys.stdout.isatty() else ""
+_END = Colors.END if sys.stdout.isatty() else ""
+
+def _say(msg: str, pfx: str = "") -> None:
+    """Write a message from the plugin to stdout, optionally prefixed with a color."""
+    sys.stdout.write(f"{pfx}[ytdlp] {msg}{_END if pfx else ''}\n")
+
+@dataclasses.dataclass(slots=True)
 class AlbumDetails:
     title: str
     artist: str
     playlist_url: str
 
+    def __post_init__(self):
+        # Title and artist are used as directory names in the cache
+        self.title = self.title.translate(_SANITIZE_TABLE)
+        self.artist = self.artist.translate(_SANITIZE_TABLE)
+
     def __str__(self):
         return f'{self.title} by {self.artist}'
 
-@dataclasses.dataclass
+    @classmethod
+    def from_api_dict(cls, d: dict) -> 'AlbumDetails':
+        """Build from an album returned by YTMusic.get_album."""
+        return cls(
+            title=d['title'],
+            artist=d['artists'][0]['name'],
+            playlist_url="https://youtube.com/playlist?list=" + d['audioPlaylistId'],
+        )
+
+@dataclasses.dataclass(slots=True)
 class SingletonDetails:
     title: str
     artist: str
     track_url: str
 
+    def __post_init__(self):
+        # Title and artist are used as directory names in the cache
+        self.title = self.title.translate(_SANITIZE_TABLE)
+        self.artist = self.artist.translate(_SANITIZE_TABLE)
+
     def __str__(self):
         return f'{self.title} by {self.artist}'
 
+    @classmethod
+    def from_api_dict(cls, d: dict) -> 'SingletonDetails':
+        """Build from a song returned by YTMusic.search."""
+        return cls(
+            title=d['title'],
+            artist=d['artists'][0]['name'],
+            track_url="https://youtube.com/watch?v=" + d['videoId'],
+        )
+
+def _build_parser() -> optparse.OptionParser:
+    """Defines the parser for the ytdlp subcommand."""
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "--artist",
+        action="store",
+        help="Name of artist",
+    )
+    parser.add_option(
+        "--album",
+        action="store",
+        help="Name of album",
+    )
+    parser.add_option(
+        "--track",
+        action="store",
+        help="Name of track",
+    )
+    parser.add_option(
+        "-u", "--url",
+        dest="url",
+        action="store",
+        help="URL of YouTube playlist to download. Bypasses search.",
+    )
+    parser.add_option(
+        "-j", "--jobs",
+        dest="jobs",
+        action="store",
+        type="int",
+        help="Number of album tracks to download in parallel. Overrides concurrent_downloads.",
+    )
+    parser.add_option(
+        "--external-downloader",
+        dest="external_downloader",
+        action="store",
+        help="Program yt-dlp downloads with: 'auto', 'native', or e.g. 'aria2c'.",
+    )
+    parser.add_option(
+        "--refresh-metadata",
+        dest="refresh_metadata",
+        action="store_true",
+        default=False,
+        help="Ignore cached YouTube Music search results and fetch them again.",
+    )
+    parser.add_option(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        default=False,
+        help="Neither read nor write cached YouTube Music search results.",
+    )
+    parser.add_option(
+        "-v", "--verbose",
+        action="store_true",
+        dest="verbose",
+        default=False,
+    )
+
+    return parser
+
+# The parser holds no state, so it is built once when the plugin is loaded
+_PARSER = _build_parser()
+
 class YTDLPPlugin(BeetsPlugin):
     """A plugin for downloading music from YouTube and importing into beets."""
 
-    config: dict
     config_dir: str
     cache_dir: str
+    metadata_cache_dir: str
+    ydl_opts: dict
 
     def __init__(self, *args, **kwargs):
         """Set default values."""
@@ -47,229 +220,469 @@ class YTDLPPlugin(BeetsPlugin):
 
         self.config_dir = config.config_dir()
         self.cache_dir = self.config_dir + "/yt_dlp"
+        self.metadata_cache_dir = self.cache_dir + "/ytm_cache"
+        self._metadata_cache: dict[str, object] = {}
+
+        # Pooled HTTP session so connections to YouTube Music are reused across requests
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
 
         # Default options
-        self._config = {
+        self.config.add({
             'verbose': False,
-        }
-        self._config.update(self.config)
-        self.config = self._config
+            'concurrent_downloads': 4,
+            'concurrent_fragment_downloads': 8,
+            'metadata_cache_ttl': 7 * 24 * 60 * 60,
+            'external_downloader': 'auto',
+            'cache_max_mb': 0,
+        })
 
         # be verbose if beets is verbose
-        if not self.config.get('verbose'):
-            self.config['verbose'] = True
+        self._verbose = self.config['verbose'].get(bool) or config['verbose'].get(int) > 0
+
+        # Options shared by every YoutubeDL instance; the output template is set per download
+        self.ydl_opts = {
+            'format': 'bestaudio/best',
+            'extractaudio': True,
+            'concurrent_fragment_downloads': self.config['concurrent_fragment_downloads'].get(int),
+            'http_chunk_size': 10 * 1024 * 1024,
+            'postprocessors': [
+                # With no preferred codec the audio stream is copied rather than re-encoded
+                {'key': 'FFmpegExtractAudio'},
+                {'key': 'FFmpegMetadata'},
+            ],
+            'post_hooks': [self._record_finished],
+        }
+        # Resolved when each YoutubeDL is built, so commands that never download skip the lookup
+        self._external_downloader = self.config['external_downloader'].as_str()
+        self._download_workers = 1
+        self._ydl_local = threading.local()
+        self._manifest_lock = threading.Lock()
 
     def commands(self):
         """Add commands to beets CLI."""
 
         def ytdlp_func(lib, opts: optparse.Values, args: list[str]):
             """Download albums from YouTube and import into beets."""
-            if self.config.get("verbose"):
-                print(f"[ytdlp] Running ytdlp with opts: {opts}")
+            if opts.verbose:
+                self._verbose = True
+            if self._verbose:
+                _say(f"Running ytdlp with opts: {opts}")
+
+            if opts.external_downloader:
+                self._external_downloader = opts.external_downloader
+
+            cache_max_mb: int = self.config['cache_max_mb'].get(int)
+            if cache_max_mb:
+                self._evict_cache_if_over(cache_max_mb * 1024 * 1024)
 
             if opts.track and opts.album:
-                print(f"{Colors.WARNING}[ytdlp] Cannot specify both track and album{Colors.END}")
+                _say("Cannot specify both track and album", _WARNING_PFX)
+                return
+
+            jobs: int = (
+                opts.jobs if opts.jobs is not None
+                else self.config['concurrent_downloads'].get(int)
+            )
+            if jobs < 1:
+                _say("The number of parallel downloads must be at least 1", _WARNING_PFX)
                 return
             
             if opts.track:
-                track_details = self._get_track_details(opts.artist, opts.track, opts.url)
+                track_details = self._get_track_details(
+                    opts.artist, opts.track, opts.url, opts.refresh_metadata, not opts.no_cache,
+                )
                 if not track_details:
                     return
 
-                track_dir = self._download_singleton(track_details)
-                if not track_dir:
+                track_path = self._download_singleton(track_details)
+                if not track_path:
                     return
 
-                self._import_singleton(track_dir)
+                self._import_singleton(lib, track_path)
 
-                print(f"{Colors.SUCCESS}[ytdlp] Successfully imported {track_details}{Colors.END}")
+                _say(f"Successfully imported {track_details}", _SUCCESS_PFX)
                 return
 
             if opts.album:
-                album_details = self._get_album_details(opts.artist, opts.album, opts.url)
+                album_details = self._get_album_details(
+                    opts.artist, opts.album, opts.url, opts.refresh_metadata, not opts.no_cache,
+                )
                 if not album_details:
                     return
 
-                album_dir = self._download_album(album_details)
+                album_dir = self._download_album(album_details, jobs)
                 if not album_dir:
                     return
 
-                self._import_album(album_dir)
+                self._import_album(lib, album_dir)
 
-                print(f"{Colors.SUCCESS}[ytdlp] Successfully imported {album_details}{Colors.END}")
+                _say(f"Successfully imported {album_details}", _SUCCESS_PFX)
                 return
 
         ytdlp_command = ui.Subcommand(
             'ytdlp',
             help='Download albums from YouTube and import into beets',
-            parser=self._parser(),
+            parser=_PARSER,
         )
         ytdlp_command.func = ytdlp_func
 
         return [ytdlp_command]
 
-    def _parser(self) -> optparse.OptionParser:
-        """Defines the parser for the ytdlp subcommand."""
-        parser = optparse.OptionParser()
-        parser.add_option(
-            "--artist",
-            action="store",
-            help="Name of artist",
-        )
-        parser.add_option(
-            "--album",
-            action="store",
-            help="Name of album",
-        )
-        parser.add_option(
-            "--track",
-            action="store",
-            help="Name of track",
-        )
-        parser.add_option(
-            "-u", "--url",
-            dest="url",
-            action="store",
-            help="URL of YouTube playlist to download. Bypasses search.",
-        )
-        parser.add_option(
-            "-v", "--verbose",
-            action="store_true",
-            dest="verbose",
-            default=False,
-        )
-
-        return parser 
-
-    def _get_track_details(self, artist: str, track: str, url: str | None) -> SingletonDetails | None:
+    def _get_track_details(
+        self,
+        artist: str,
+        track: str,
+        url: str | None,
+        refresh: bool = False,
+        use_cache: bool = True,
+    ) -> SingletonDetails | None:
         """Get details for track on YouTube."""
         # If the url has been passed in, use that
         if url:
             return SingletonDetails(title=track, artist=artist, track_url=url)
 
         # Otherwise perform a search via YTMusic api
-        if self.config.get('verbose'):
-            print(f'[ytdlp] Searching for {artist} - {track} on YouTube Music')
-        ytmusic = YTMusic()
-        search_results: list[dict] = ytmusic.search(f'{artist} {track}', filter="songs")
+        if self._verbose:
+            _say(f'Searching for {artist} - {track} on YouTube Music')
+        search_results: list[dict] = self._ytmusic_request(
+            'search', f'{artist} {track}', filter="songs", limit=1,
+            trim=_trim_song_results, refresh=refresh, use_cache=use_cache,
+        )
         if not search_results:
-            print(f'[ytdlp] No results found for {artist} - {track}')
-            print('[ytdlp] Please check the artist and track names and try again.')
-            print('[ytdlp] Or consider passing in the url to a track via the --url flag.')
+            _say(f'No results found for {artist} - {track}')
+            _say('Please check the artist and track names and try again.')
+            _say('Or consider passing in the url to a track via the --url flag.')
             return None
-        song_details: dict = search_results[0]
-        return SingletonDetails(
-            title=song_details['title'],
-            artist=song_details['artists'][0]['name'],
-            track_url="https://youtube.com/watch?v=" + song_details['videoId']
-        )
-
-    def _get_album_details(self, artist: str, album: str, url: str | None) -> AlbumDetails | None:
+        return SingletonDetails.from_api_dict(search_results[0])
+
+    def _get_album_details(
+        self,
+        artist: str,
+        album: str,
+        url: str | None,
+        refresh: bool = False,
+        use_cache: bool = True,
+    ) -> AlbumDetails | None:
         """Get details for album playlist on YouTube."""
         # If the url has been passed in, use that
         if url:
             return AlbumDetails(title=album, artist=artist, playlist_url=url)
 
         # Otherwise perform a search via YTMusic api
-        if self.config.get('verbose'):
-            print(f'[ytdlp] Searching for {artist} - {album} on YouTube Music')
-        ytmusic = YTMusic()
-        search_results: list[dict] = ytmusic.search(f'{artist} {album}', filter="albums")
+        if self._verbose:
+            _say(f'Searching for {artist} - {album} on YouTube Music')
+        search_results: list[dict] = self._ytmusic_request(
+            'search', f'{artist} {album}', filter="albums", limit=1,
+            trim=_trim_album_results, refresh=refresh, use_cache=use_cache,
+        )
         if not search_results:
-            print(f'[ytdlp] No results found for {artist} - {album}')
-            print('[ytdlp] Please check the artist and album names and try again.')
-            print('[ytdlp] Or consider passing in the url to a playlist via the --url flag.')
-            return None
-        album_details: dict = ytmusic.get_album(search_results[0]['browseId'])
-        available_tracks: bool = all([track['isAvailable'] for track in album_details['tracks']])
-        if not available_tracks:
-            print(f'[ytdlp] Not all tracks are available for {album} by {artist}')
-            print("[ytdlp] Consider passing in the url to a playlist via the --url flag.")
+            _say(f'No results found for {artist} - {album}')
+            _say('Please check the artist and album names and try again.')
+            _say('Or consider passing in the url to a playlist via the --url flag.')
             return None
-        return AlbumDetails(
-            title=album_details['title'],
-            artist=album_details['artists'][0]['name'],
-            playlist_url="https://youtube.com/playlist?list=" + album_details['audioPlaylistId']
+        album_details: dict = self._ytmusic_request(
+            'get_album', search_results[0]['browseId'],
+            trim=_trim_album, cache_if=_album_available, refresh=refresh, use_cache=use_cache,
         )
-
-    def _download_album(self, ad: AlbumDetails) -> str:
+        if not _album_available(album_details):
+            _say(f'Not all tracks are available for {album} by {artist}')
+            _say("Consider passing in the url to a playlist via the --url flag.")
+            return None
+        return AlbumDetails.from_api_dict(album_details)
+
+    @functools.cached_property
+    def ytmusic(self) -> 'YTMusic':
+        """The YTMusic client, created on first use and reused for every request."""
+        from ytmusicapi import YTMusic
+        return YTMusic(requests_session=self._http)
+
+    def _ytmusic_request(
+        self,
+        endpoint: str,
+        *args,
+        trim: Callable[[Any], Any] | None = None,
+        cache_if: Callable[[Any], bool] = bool,
+        refresh: bool = False,
+        use_cache: bool = True,
+        **kwargs,
+    ) -> Any:
+        """Call a YTMusic endpoint, caching the response in memory and on disk.
+
+        If given, `trim` reduces the response to the fields the plugin uses before it
+        is cached, keeping the cached JSON small and cheap to parse on later runs.
+        Only responses passing `cache_if`, by default any non-empty one, are cached,
+        so a transient empty or partial response is fetched again on the next run.
+        With `refresh` cached responses are ignored but replaced, while disabling
+        `use_cache` bypasses the cache entirely.
+        """
+        if not use_cache:
+            response = getattr(self.ytmusic, endpoint)(*args, **kwargs)
+            return trim(response) if trim is not None else response
+
+        key = hashlib.md5(f'{endpoint}:{args}:{sorted(kwargs.items())}'.encode()).hexdigest()
+        cache_file = self.metadata_cache_dir + "/" + key + ".json"
+
+        if not refresh:
+            if key in self._metadata_cache:
+                return self._metadata_cache[key]
+            ttl: int = self.config['metadata_cache_ttl'].get(int)
+            try:
+                if time.time() - os.path.getmtime(cache_file) < ttl:
+                    with open(cache_file, 'rb') as f:
+                        response = _json_loads(f.read())
+                    self._metadata_cache[key] = response
+                    return response
+            except (OSError, ValueError):
+                pass
+
+        response = getattr(self.ytmusic, endpoint)(*args, **kwargs)
+        if trim is not None:
+            response = trim(response)
+        if not cache_if(response):
+            return response
+        self._metadata_cache[key] = response
+
+        # Write to a temporary file first so concurrent readers never see partial JSON
+        os.makedirs(self.metadata_cache_dir, exist_ok=True)
+        with open(cache_file + ".tmp", 'wb') as f:
+            f.write(_json_dumps(response))
+        os.replace(cache_file + ".tmp", cache_file)
+
+        return response
+
+    def _clear_metadata_cache(self) -> None:
+        """Clear the cache of YouTube Music responses."""
+        self._metadata_cache.clear()
+        shutil.rmtree(self.metadata_cache_dir, ignore_errors=True)
+
+    def _external_downloader_opts(self) -> dict[str, Any]:
+        """Get the yt-dlp options selecting the program to download with.
+
+        'auto' picks aria2c when it is on the PATH, falling back to yt-dlp's native downloader.
+        """
+        name = self._external_downloader
+        if name == 'auto':
+            name = 'aria2c' if shutil.which('aria2c') else 'native'
+        if name == 'native':
+            return {}
+        opts: dict[str, Any] = {'external_downloader': {'default': name}}
+        if name == 'aria2c':
+            # Split each download over multiple connections to work around per-stream
+            # throttling, sharing 16 connections between the tracks downloaded in parallel
+            conns = max(1, 16 // self._download_workers)
+            opts['external_downloader_args'] = {
+                'aria2c': [f'-x{conns}', f'-s{conns}', '-k1M', '--file-allocation=none'],
+            }
+        return opts
+
+    def _ydl(self, outtmpl: str) -> 'YoutubeDL':
+        """Get the YoutubeDL instance of the current thread, writing to the given template.
+
+        Constructing a YoutubeDL re-initializes its extractors and cookie jar, so each
+        thread keeps a single instance alive and only swaps out the output template.
+        """
+        ydl: YoutubeDL | None = getattr(self._ydl_local, 'ydl', None)
+        if ydl is None:
+            # Imported under another name so the annotation above keeps referring to the
+            # module-level name rather than this local one
+            from yt_dlp import YoutubeDL as _YoutubeDL
+            ydl = _YoutubeDL({**self.ydl_opts, **self._external_downloader_opts()})
+            self._ydl_local.ydl = ydl
+            atexit.register(ydl.close)
+        ydl.params['outtmpl']['default'] = outtmpl
+        self._ydl_local.finished = []
+        return ydl
+
+    def _record_finished(self, filepath: str) -> None:
+        """yt-dlp post hook recording the final path of each file downloaded by this thread."""
+        self._ydl_local.finished.append(filepath)
+
+    def _download_album(self, ad: AlbumDetails, jobs: int) -> str:
         """Download album from YouTube."""
-        if self.config.get('verbose'):
-            print(f'[ytdlp] Downloading {ad}')
-
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'extractaudio': True,
-            'outtmpl': self.cache_dir + "/" + ad.artist + "/" + ad.title + "/%(title)s.%(ext)s",
-            'postprocessors': [
-                {'key': 'FFmpegExtractAudio'},
-                {'key': 'FFmpegMetadata'},
-            ],
-        }
-
-        with YoutubeDL(ydl_opts) as ydl:
-            returncode = ydl.download([ad.playlist_url])
-
-        if returncode != 0:
-            print(f'[ytdlp] Error downloading {ad}')
+        from yt_dlp.utils import DownloadError
+
+        if self._verbose:
+            _say(f'Downloading {ad}')
+
+        album_dir = f"{self.cache_dir}/{ad.artist}/{ad.title}"
+        outtmpl = f"{album_dir}/%(title)s.%(ext)s"
+
+        max_workers = min(jobs, MAX_CONCURRENT_DOWNLOADS)
+        self._download_workers = max_workers
+
+        # Resolve the playlist entries without downloading them,
+        # so that each track can be fetched by its own worker
+        ydl = self._ydl(outtmpl)
+        playlist: dict = ydl.extract_info(ad.playlist_url, download=False, process=False)
+        # Unprocessed results may be redirects, e.g. album browse pages or region redirects
+        while playlist.get('_type') in ('url', 'url_transparent'):
+            playlist = ydl.extract_info(
+                playlist['url'], ie_key=playlist.get('ie_key'), download=False, process=False,
+            )
+
+        # Tracks finished by an interrupted run are already in the cache
+        present = self._finished_tracks(album_dir)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # The entries are resolved lazily page by page, so submit each track as soon
+            # as it is known instead of waiting for the whole playlist to be listed
+            futures = []
+            entries = 0
+            for entry in playlist.get('entries') or []:
+                entries += 1
+                if entry.get('id') in present:
+                    if self._verbose:
+                        _say(f"Skipping {present[entry['id']]}, already downloaded")
+                    continue
+                url: str = entry.get('webpage_url') or entry['url']
+                futures.append(executor.submit(
+                    self._download_track, entry.get('id'), url, album_dir, outtmpl,
+                ))
+            for future in as_completed(futures):
+                # Without ignoreerrors yt-dlp raises on a failed track rather than
+                # returning a non-zero code
+                try:
+                    failed = future.result() != 0
+                except DownloadError:
+                    failed = True
+                if failed:
+                    _say(f'Error downloading {ad}')
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return ""
+
+        if not entries and not present:
+            _say(f'Error downloading {ad}: no tracks found at {ad.playlist_url}')
             return ""
 
-        return self.cache_dir + "/" + ad.artist + "/" + ad.title
+        return album_dir
+
+    def _download_track(
+        self, video_id: str | None, url: str, album_dir: str, outtmpl: str,
+    ) -> int:
+        """Download a single track of a playlist, returning the yt-dlp return code."""
+        returncode = int(self._ydl(outtmpl).download([url]))
+        finished: list[str] = self._ydl_local.finished
+        if returncode == 0 and video_id and finished:
+            # Post hooks only fire once postprocessing is done, so the file is complete
+            with self._manifest_lock, open(
+                f"{album_dir}/{FINISHED_MANIFEST}", 'a', encoding='utf-8',
+            ) as f:
+                f.write(f"{video_id}\t{os.path.basename(finished[-1])}\n")
+        return returncode
+
+    def _finished_tracks(self, album_dir: str) -> dict[str, str]:
+        """Map the video ids of fully downloaded tracks in an album directory to their files.
+
+        Any other file is a leftover of an interrupted download, such as a not yet
+        extracted .webm or a half-written audio file, and is removed.
+        """
+        finished: dict[str, str] = {}
+        try:
+            with open(f"{album_dir}/{FINISHED_MANIFEST}", encoding='utf-8') as f:
+                for line in f:
+                    video_id, _, filename = line.rstrip('\n').partition('\t')
+                    if os.path.isfile(f"{album_dir}/{filename}"):
+                        finished[video_id] = filename
+        except FileNotFoundError:
+            pass
+
+        keep = set(finished.values()) | {FINISHED_MANIFEST}
+        try:
+            with os.scandir(album_dir) as it:
+                for entry in it:
+                    if entry.name not in keep and entry.is_file(follow_symlinks=False):
+                        os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+        return finished
 
     def _download_singleton(self, sd: SingletonDetails) -> str:
         """Download track from YouTube."""
-        if self.config.get('verbose'):
-            print(f'[ytdlp] Downloading {sd}')
+        if self._verbose:
+            _say(f'Downloading {sd}')
 
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'extractaudio': True,
-            'outtmpl': self.cache_dir + "/" + sd.artist + "/%(title)s.%(ext)s",
-            'postprocessors': [
-                {'key': 'FFmpegExtractAudio'},
-                {'key': 'FFmpegMetadata'},
-            ],
-        }
+        outtmpl = f"{self.cache_dir}/{sd.artist}/%(title)s.%(ext)s"
+        returncode = self._ydl(outtmpl).download([sd.track_url])
+        finished: list[str] = self._ydl_local.finished
 
-        with YoutubeDL(ydl_opts) as ydl:
-            returncode = ydl.download([sd.track_url])
-
-        if returncode != 0:
-            print(f'[ytdlp] Error downloading {sd}')
+        if returncode != 0 or not finished:
+            _say(f'Error downloading {sd}')
             return ""
 
-        return self.cache_dir + "/" + sd.artist
+        # Import the exact file rather than walking the artist's whole cache directory
+        return finished[-1]
 
-    def _import_album(self, album_dir: str) -> str | None:
+    def _import_album(self, lib, album_dir: str) -> str | None:
         """Import album into beets."""
-        beet_cmd = ['beet', 'import', '-m', album_dir]
-        if os.getenv('BEETS_ENV') == 'develop':
-            beet_cmd.extend(['-c', 'env.config.yml'])
-        if self.config.get('verbose'):
-            print("[ytdlp] Running beets: " + ' '.join(beet_cmd))
-        process = subprocess.run(beet_cmd)
-        if process.returncode != 0:
-            print(f"[ytdlp] Error importing {album_dir} into beets")
-            return None
+        return self._import(lib, ['-m', album_dir])
 
-        return album_dir
-
-    def _import_singleton(self, track_dir: str) -> str | None:
+    def _import_singleton(self, lib, track_path: str) -> str | None:
         """Import track into beets."""
-        beet_cmd = ['beet', 'import', '-m', '-s', track_dir]
-        if os.getenv('BEETS_ENV') == 'develop':
-            beet_cmd.extend(['-c', 'env.config.yml'])
-        if self.config.get('verbose'):
-            print("[ytdlp] Running beets: " + ' '.join(beet_cmd))
-        process = subprocess.run(beet_cmd)
-        if process.returncode != 0:
-            print(f"[ytdlp] Error importing {track_dir} into beets")
+        return self._import(lib, ['-m', '-s', track_path])
+
+    def _import(self, lib, import_args: list[str]) -> str | None:
+        """Run the beets import command in-process, returning the imported path."""
+        if self._verbose:
+            _say("Running beets import " + ' '.join(import_args))
+        opts, args = import_cmd.parser.parse_args(import_args)
+        import_path: str = args[0]
+        try:
+            import_cmd.func(lib, opts, args)
+        except ui.UserError as e:
+            _say(f"Error importing {import_path} into beets: {e}")
             return None
 
-        return track_dir
+        return import_path
 
     def _clear_cache(self, d: str) -> None:
         """Clear the cache of downloaded files."""
-        os.remove(d)
-        
-
+        shutil.rmtree(d, ignore_errors=True)
+
+    def _evict_cache_if_over(self, max_bytes: int) -> None:
+        """Remove the oldest cached downloads until the cache takes up at most max_bytes."""
+        # Albums and singletons live one level below their artist's directory
+        downloads: list[tuple[float, int, str, bool]] = []
+        try:
+            with os.scandir(self.cache_dir) as artists:
+                for artist in artists:
+                    if not artist.is_dir(follow_symlinks=False):
+                        continue
+                    if artist.path == self.metadata_cache_dir:
+                        continue
+                    with os.scandir(artist.path) as it:
+                        for entry in it:
+                            mtime = entry.stat(follow_symlinks=False).st_mtime
+                            downloads.append((
+                                mtime, _tree_size(entry), entry.path,
+                                entry.is_dir(follow_symlinks=False),
+                            ))
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            _say(f'Error reading the cache at {self.cache_dir}: {e}', _WARNING_PFX)
+            return
+
+        total = sum(size for _, size, _, _ in downloads)
+        for _, size, path, is_dir in sorted(downloads):
+            if total <= max_bytes:
+                break
+            if self._verbose:
+                _say(f'Evicting {path} from the cache')
+            # A symlink is removed itself rather than the directory it points to
+            try:
+                if is_dir:
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError as e:
+                _say(f'Error evicting {path} from the cache: {e}', _WARNING_PFX)
+                continue
+            total -= size